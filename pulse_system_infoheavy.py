@@ -11,7 +11,7 @@
 #  - Optimized to avoid heavy blocking operations; keeps UI responsive
 #
 # Requirements:
-#   pip install pyqt5 psutil pyqtgraph
+#   pip install pyqt5 psutil pyqtgraph numpy
 #
 # Run:
 #   python PulseSystemInfoheavy.py
@@ -19,8 +19,11 @@
 from __future__ import annotations
 import sys
 import time
+import functools
+import heapq
+import sysconfig
 import psutil
-from collections import deque
+import numpy as np
 from PyQt5 import QtWidgets, QtCore, QtGui
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QProgressBar,
@@ -33,49 +36,128 @@ import shutil, os, math, platform, subprocess
 
 APP_UPDATE_INTERVAL_MS_DEFAULT = 1000  # default 1 second
 MAX_HISTORY = 120  # keep 120 samples for charts (~2 minutes at 1s interval)
+PLOT_INTERVAL_MULTIPLIER = 2  # charts redraw every 2 update intervals
+PROC_INTERVAL_MULTIPLIER = 3  # process list is rescanned every 3 update intervals
+PARTITION_CACHE_SECONDS = 30  # disk_partitions() is re-read at most this often
+IS_LINUX = sys.platform.startswith('linux')
+# psutil only supports free-threaded (PEP 703) CPython from 7.1.0; older builds get per-process CPU sampling turned off
+FREE_THREADING = bool(sysconfig.get_config_var('Py_GIL_DISABLED'))
+PSUTIL_FREE_THREADING_MIN = (7, 1, 0)
+PER_PROCESS_CPU = not FREE_THREADING or psutil.version_info >= PSUTIL_FREE_THREADING_MIN
+# filesystems counted in the overall disk total; every partition is still listed individually
+_REAL_FS = {
+    'ext2', 'ext3', 'ext4', 'xfs', 'btrfs', 'zfs', 'f2fs', 'ntfs', 'ntfs3', 'fuseblk', 'refs',
+    'vfat', 'fat', 'fat32', 'msdos', 'exfat', 'apfs', 'hfs',
+}
+
+_BYTE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+_RATE_UNITS = ('B/s', 'KB/s', 'MB/s')
+_INV_KIB = 1 / 1024.0
 
 def human_readable_bytes(n):
     if n is None:
         return "0 B"
-    step = 1024.0
-    units = ['B', 'KB', 'MB', 'GB', 'TB']
-    i = 0
-    while n >= step and i < len(units) - 1:
-        n /= step
-        i += 1
-    return f"{n:.1f} {units[i]}"
+    n = int(n)
+    i = max(0, min(len(_BYTE_UNITS) - 1, (n.bit_length() - 1) // 10))
+    return f"{n / (1 << (10 * i)):.1f} {_BYTE_UNITS[i]}"
+
+# partition and RAM totals are constant from tick to tick; used byte counts are formatted uncached
+human_readable_total = functools.lru_cache(maxsize=64)(human_readable_bytes)
+
+def disk_usage(mountpoint):
+    if IS_LINUX:
+        st = os.statvfs(mountpoint)
+        total = st.f_blocks * st.f_frsize
+        used = (st.f_blocks - st.f_bfree) * st.f_frsize
+        avail = st.f_bavail * st.f_frsize
+        return (used / (used + avail) * 100.0 if used + avail > 0 else 0.0), used, total
+    u = psutil.disk_usage(mountpoint)
+    return u.percent, u.used, u.total
+
+def _meminfo():
+    m = {}
+    with open('/proc/meminfo', 'rb') as f:
+        for line in f:
+            key, _, rest = line.partition(b':')
+            m[key] = int(rest.split()[0]) * 1024
+    total, free = m[b'MemTotal'], m[b'MemFree']
+    avail = m.get(b'MemAvailable')
+    if avail is None:
+        avail = free + m.get(b'Buffers', 0) + m.get(b'Cached', 0) + m.get(b'SReclaimable', 0)
+    used = total - avail
+    percent = used / total * 100.0 if total > 0 else 0.0
+    return total, used, percent
+
+def _stat_cpu():
+    # guest time is already included in user/nice, so only the first 8 fields are summed
+    with open('/proc/stat', 'rb') as f:
+        fields = [int(v) for v in f.readline().split()[1:9]]
+    return fields[3] + fields[4], sum(fields)
+
+def _proc_starttime(pid):
+    # field 22 of /proc/<pid>/stat (clock ticks since boot); comm may contain spaces or ')', so split after the last ')'
+    try:
+        with open(f'/proc/{pid}/stat', 'rb') as f:
+            data = f.read()
+    except PermissionError:
+        raise psutil.AccessDenied(pid)
+    except OSError:
+        raise psutil.NoSuchProcess(pid)
+    return int(data.rpartition(b')')[2].split()[19])
 
 class SystemData:
     def __init__(self):
         self.last_net = psutil.net_io_counters()
         self.last_time = time.time()
-        self.cpu_hist = deque(maxlen=MAX_HISTORY)
-        self.ram_hist = deque(maxlen=MAX_HISTORY)
-        self.disk_hist = deque(maxlen=MAX_HISTORY)
-        self.net_sent_hist = deque(maxlen=MAX_HISTORY)
-        self.net_recv_hist = deque(maxlen=MAX_HISTORY)
-        for _ in range(MAX_HISTORY):
-            self.cpu_hist.append(0.0)
-            self.ram_hist.append(0.0)
-            self.disk_hist.append(0.0)
-            self.net_sent_hist.append(0.0)
-            self.net_recv_hist.append(0.0)
+        self._last_cpu_times = _stat_cpu() if IS_LINUX else None
+        # mirrored ring buffers: each sample is written at idx and idx + MAX_HISTORY, so the oldest -> newest window is
+        # always the contiguous slice [idx, idx + MAX_HISTORY) and never needs reassembling
+        self.idx = 0
+        self.cpu_hist = np.zeros(2 * MAX_HISTORY, np.float32)
+        self.ram_hist = np.zeros(2 * MAX_HISTORY, np.float32)
+        self.disk_hist = np.zeros(2 * MAX_HISTORY, np.float32)
+        self.net_sent_kbps_hist = np.zeros(2 * MAX_HISTORY, np.float32)
+        self.net_recv_kbps_hist = np.zeros(2 * MAX_HISTORY, np.float32)
+        self.proc_cache: dict[int, psutil.Process] = {}
+        # (name, name.lower(), starttime); starttime is only recorded on Linux, other platforms use Process.is_running()
+        self.proc_name_cache: dict[int, tuple[str, str, int | None]] = {}
+        self._parts_cache = None
+        self._parts_cache_ts = 0.0
 
     def sample(self):
         now = time.time()
-        cpu = psutil.cpu_percent(interval=None)
-        ram = psutil.virtual_memory().percent
+        if IS_LINUX:
+            idle, total = _stat_cpu()
+            last_idle, last_total = self._last_cpu_times
+            self._last_cpu_times = (idle, total)
+            if total > last_total:
+                cpu = (1.0 - (idle - last_idle) / (total - last_total)) * 100.0
+                cpu = max(0.0, min(100.0, cpu))
+            else:
+                cpu = 0.0
+            ram_total, ram_used, ram = _meminfo()
+        else:
+            cpu = psutil.cpu_percent(interval=None)
+            vm = psutil.virtual_memory()
+            ram, ram_used, ram_total = vm.percent, vm.used, vm.total
         total_used = 0
         total_total = 0
+        partitions = []
         try:
-            parts = psutil.disk_partitions(all=False)
-            for p in parts:
+            if self._parts_cache is None or now - self._parts_cache_ts >= PARTITION_CACHE_SECONDS:
+                parts = psutil.disk_partitions(all=False)
+                real = [p for p in parts if p.fstype.lower() in _REAL_FS] or parts
+                self._parts_cache = [(p, p in real) for p in parts]
+                self._parts_cache_ts = now
+            for p, counted in self._parts_cache:
                 try:
-                    u = psutil.disk_usage(p.mountpoint)
-                    total_used += u.used
-                    total_total += u.total
+                    percent, used, total = disk_usage(p.mountpoint)
                 except Exception:
                     continue
+                if counted:
+                    total_used += used
+                    total_total += total
+                partitions.append((p.device, p.mountpoint, percent, used, total))
             disk_percent = (total_used / total_total) * 100.0 if total_total > 0 else 0.0
         except Exception:
             try:
@@ -88,12 +170,112 @@ class SystemData:
         recv_rate = (net.bytes_recv - self.last_net.bytes_recv) / elapsed
         self.last_net = net
         self.last_time = now
-        self.cpu_hist.append(cpu)
-        self.ram_hist.append(ram)
-        self.disk_hist.append(disk_percent)
-        self.net_sent_hist.append(sent_rate)
-        self.net_recv_hist.append(recv_rate)
-        return {"cpu": cpu, "ram": ram, "disk_percent": disk_percent, "net_sent": sent_rate, "net_recv": recv_rate}
+        i, j = self.idx, self.idx + MAX_HISTORY
+        self.cpu_hist[i] = self.cpu_hist[j] = cpu
+        self.ram_hist[i] = self.ram_hist[j] = ram
+        self.disk_hist[i] = self.disk_hist[j] = disk_percent
+        self.net_sent_kbps_hist[i] = self.net_sent_kbps_hist[j] = sent_rate * _INV_KIB
+        self.net_recv_kbps_hist[i] = self.net_recv_kbps_hist[j] = recv_rate * _INV_KIB
+        self.idx = (i + 1) % MAX_HISTORY
+        return {"cpu": cpu, "ram": ram, "ram_used": ram_used, "ram_total": ram_total, "disk_percent": disk_percent, "net_sent": sent_rate, "net_recv": recv_rate, "partitions": partitions}
+
+    def sample_processes(self):
+        procs = []
+        pids = psutil.pids()
+        for pid in pids:
+            p = self.proc_cache.get(pid)
+            names = self.proc_name_cache.get(pid)
+            try:
+                starttime = _proc_starttime(pid) if IS_LINUX else None
+                if p is not None:
+                    # a different start time (or is_running() failing) means the PID was recycled since p was cached
+                    same = names is not None and (names[2] == starttime if IS_LINUX else p.is_running())
+                    if not same:
+                        p = None
+                if p is None:
+                    p = self.proc_cache[pid] = psutil.Process(pid)
+                    names = None
+                with p.oneshot():
+                    if names is None:
+                        name = p.name() or str(pid)
+                        names = self.proc_name_cache[pid] = (name, name.lower(), starttime)
+                    cpu = p.cpu_percent(interval=None) if PER_PROCESS_CPU else 0.0
+                    mem = p.memory_percent()
+                procs.append((names[0], pid, cpu, mem, p, names[1]))
+            except (psutil.ZombieProcess, psutil.AccessDenied):
+                continue
+            except psutil.NoSuchProcess:
+                self.proc_cache.pop(pid, None)
+                self.proc_name_cache.pop(pid, None)
+        for pid in self.proc_cache.keys() - set(pids):
+            del self.proc_cache[pid]
+            self.proc_name_cache.pop(pid, None)
+        return procs
+
+    def prime_processes(self):
+        if not PER_PROCESS_CPU: return
+        for pid in psutil.pids():
+            try:
+                starttime = _proc_starttime(pid) if IS_LINUX else None
+                p = psutil.Process(pid)
+                with p.oneshot():
+                    name = p.name() or str(pid)
+                    p.cpu_percent(interval=None)
+                self.proc_cache[pid] = p
+                self.proc_name_cache[pid] = (name, name.lower(), starttime)
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                pass
+
+    def history(self, buf):
+        return buf[self.idx:self.idx + MAX_HISTORY].copy()
+
+class SamplerWorker(QtCore.QObject):
+    sampled = QtCore.pyqtSignal(dict)
+    history_sampled = QtCore.pyqtSignal(dict)
+    processes_sampled = QtCore.pyqtSignal(list)
+
+    def __init__(self, interval_ms=APP_UPDATE_INTERVAL_MS_DEFAULT):
+        super().__init__()
+        self.data = SystemData()
+        self.interval_ms = interval_ms
+        self.timer = None; self.proc_timer = None
+
+    @QtCore.pyqtSlot()
+    def start(self):
+        # created here rather than in __init__ so the timers belong to the sampler thread
+        self.timer = QTimer(self); self.timer.setInterval(self.interval_ms)
+        self.timer.timeout.connect(self.sample); self.timer.start()
+        self.proc_timer = QTimer(self); self.proc_timer.setInterval(self.interval_ms * PROC_INTERVAL_MULTIPLIER)
+        self.proc_timer.timeout.connect(self.sample_processes); self.proc_timer.start()
+        self.sample()
+        QTimer.singleShot(0, self.data.prime_processes); QTimer.singleShot(self.interval_ms, self.sample_processes)
+
+    @QtCore.pyqtSlot(int)
+    def set_interval(self, val):
+        self.interval_ms = val
+        if self.timer is not None: self.timer.setInterval(val); self.proc_timer.setInterval(val * PROC_INTERVAL_MULTIPLIER)
+
+    @QtCore.pyqtSlot(bool)
+    def set_visible(self, visible):
+        if self.proc_timer is None: return
+        if visible: self.proc_timer.start(); self.sample_processes()
+        else: self.proc_timer.stop()
+
+    @QtCore.pyqtSlot()
+    def refresh(self): self.sample(); self.sample_history(); self.sample_processes()
+
+    @QtCore.pyqtSlot()
+    def sample_processes(self): self.processes_sampled.emit(self.data.sample_processes())
+
+    @QtCore.pyqtSlot()
+    def sample(self): self.sampled.emit(self.data.sample())
+
+    @QtCore.pyqtSlot()
+    def sample_history(self):
+        d = self.data
+        h = {"cpu_hist": d.history(d.cpu_hist), "ram_hist": d.history(d.ram_hist), "disk_hist": d.history(d.disk_hist)}
+        h["net_sent_kbps_hist"] = d.history(d.net_sent_kbps_hist); h["net_recv_kbps_hist"] = d.history(d.net_recv_kbps_hist)
+        self.history_sampled.emit(h)
 
 class PartitionWidget(QWidget):
     def __init__(self, device, mountpoint, percent, used, total):
@@ -102,12 +284,16 @@ class PartitionWidget(QWidget):
         layout.setContentsMargins(4, 2, 4, 2)
         self.label = QLabel(f"{device} ({mountpoint})")
         self.pbar = QProgressBar(); self.pbar.setMaximum(100); self.pbar.setValue(int(min(100, percent)))
-        self.info = QLabel(f"{percent:.1f}% ({human_readable_bytes(used)} / {human_readable_bytes(total)})")
+        self.info = QLabel(f"{percent:.1f}% ({human_readable_bytes(used)} / {human_readable_total(total)})")
         layout.addWidget(self.label, 3)
         layout.addWidget(self.pbar, 2)
         layout.addWidget(self.info, 2)
         self.setLayout(layout)
 
+    def update_usage(self, percent, used, total):
+        self.pbar.setValue(int(min(100, percent)))
+        self.info.setText(f"{percent:.1f}% ({human_readable_bytes(used)} / {human_readable_total(total)})")
+
 class ProcessItemWidget(QWidget):
     def __init__(self, name, pid, cpu, mem):
         super().__init__()
@@ -122,7 +308,18 @@ class ProcessItemWidget(QWidget):
         layout.addWidget(self.memBar, 1)
         self.setLayout(layout)
 
+    def set_process(self, name, pid, cpu, mem):
+        text = f"{name} (PID {pid})"
+        if text != self.nameLabel.text(): self.nameLabel.setText(text); self.nameLabel.setToolTip(text)
+        self.cpuBar.setValue(int(min(100, cpu))); self.cpuBar.setFormat(f"CPU: {cpu:.1f}%")
+        self.memBar.setValue(int(min(100, mem))); self.memBar.setFormat(f"RAM: {mem:.1f}%")
+
 class PulseSystemInfoApp(QtWidgets.QMainWindow):
+    interval_changed = QtCore.pyqtSignal(int)
+    refresh_requested = QtCore.pyqtSignal()
+    plot_requested = QtCore.pyqtSignal()
+    visibility_changed = QtCore.pyqtSignal(bool)
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Pulse System Info - Heavy")
@@ -148,66 +345,113 @@ class PulseSystemInfoApp(QtWidgets.QMainWindow):
         self.apply_btn = QPushButton("Apply"); ctrl_grid.addWidget(self.apply_btn, 2, 3); self.refresh_btn = QPushButton("Refresh Now"); ctrl_grid.addWidget(self.refresh_btn, 2, 1)
         left_v.addWidget(QLabel("Processes: (double-click to open executable location)")); self.process_list = QListWidget(); left_v.addWidget(self.process_list, 6)
         right_v = QVBoxLayout(); main_layout.addLayout(right_v, 5)
-        pg.setConfigOptions(antialias=True)
+        pg.setConfigOptions(antialias=False, useOpenGL=False)
         self.cpu_plot = pg.PlotWidget(title="CPU (%) - history"); self.cpu_plot.setYRange(0,100)
         self.ram_plot = pg.PlotWidget(title="RAM (%) - history"); self.ram_plot.setYRange(0,100)
         self.disk_plot = pg.PlotWidget(title="Disk (%) - history"); self.disk_plot.setYRange(0,100)
         self.net_plot = pg.PlotWidget(title="Network (KB/s) - history"); self.net_plot.addLegend(); self.net_plot.setLabel('left','KB/s')
-        self.cpu_curve = self.cpu_plot.plot(pen=pg.mkPen('y', width=1.5))
-        self.ram_curve = self.ram_plot.plot(pen=pg.mkPen('c', width=1.5))
-        self.disk_curve = self.disk_plot.plot(pen=pg.mkPen('m', width=1.5))
-        self.net_sent_curve = self.net_plot.plot(name='Sent', pen=pg.mkPen('g', width=1.2))
-        self.net_recv_curve = self.net_plot.plot(name='Recv', pen=pg.mkPen('r', width=1.2))
+        self.cpu_curve = self.cpu_plot.plot(pen=pg.mkPen('y', width=1))
+        self.ram_curve = self.ram_plot.plot(pen=pg.mkPen('c', width=1))
+        self.disk_curve = self.disk_plot.plot(pen=pg.mkPen('m', width=1))
+        self.net_sent_curve = self.net_plot.plot(name='Sent', pen=pg.mkPen('g', width=1))
+        self.net_recv_curve = self.net_plot.plot(name='Recv', pen=pg.mkPen('r', width=1))
+        for plot in (self.cpu_plot, self.ram_plot, self.disk_plot, self.net_plot):
+            plot.setXRange(-MAX_HISTORY+1, 0, padding=0)
+            plot.setDownsampling(mode='peak', auto=True); plot.setClipToView(True); plot.getPlotItem().setMouseEnabled(x=False, y=False)
         right_v.addWidget(self.cpu_plot,1); right_v.addWidget(self.ram_plot,1); right_v.addWidget(self.disk_plot,1); right_v.addWidget(self.net_plot,1)
-        self.status = self.statusBar(); self.data = SystemData(); self.timer = QTimer(); self.timer.setInterval(APP_UPDATE_INTERVAL_MS_DEFAULT)
-        self.timer.timeout.connect(self.update_all); self.timer.start()
-        self.search_input.textChanged.connect(self.update_process_list)
-        self.top_spin.valueChanged.connect(self.update_process_list)
-        self.sort_combo.currentIndexChanged.connect(self.update_process_list)
+        self.status = self.statusBar()
+        if not PER_PROCESS_CPU: self.status.addPermanentWidget(QLabel(f"Free-threaded Python with psutil {psutil.__version__}: per-process CPU disabled"))
+        self.procs = []; self.last_sample = None; self._partition_keys = []; self._partition_widgets = []; self._row_widgets = []
+        self.x_axis = np.arange(-MAX_HISTORY+1, 1, dtype=np.int32)
+        self.sampler_thread = QtCore.QThread(self); self.sampler = SamplerWorker(APP_UPDATE_INTERVAL_MS_DEFAULT); self.sampler.moveToThread(self.sampler_thread)
+        self.sampler_thread.started.connect(self.sampler.start); self.sampler_thread.finished.connect(self.sampler.deleteLater)
+        self.sampler.sampled.connect(self.on_sample); self.sampler.processes_sampled.connect(self.on_processes)
+        self.interval_changed.connect(self.sampler.set_interval); self.refresh_requested.connect(self.sampler.refresh)
+        self.plot_requested.connect(self.sampler.sample_history); self.sampler.history_sampled.connect(self.update_plots)
+        self.visibility_changed.connect(self.sampler.set_visible); self._was_hidden = False
+        self.plot_timer = QTimer(self); self.plot_timer.setInterval(APP_UPDATE_INTERVAL_MS_DEFAULT * PLOT_INTERVAL_MULTIPLIER)
+        self.plot_timer.timeout.connect(self.request_plots); self.plot_timer.start()
+        # the lambda keeps the signal's argument from being routed to QTimer.start(msec)
+        self._debounce = QTimer(self, singleShot=True, interval=200); self._debounce.timeout.connect(self.update_process_list)
+        restart = lambda *_: self._debounce.start()
+        self.search_input.textChanged.connect(restart)
+        self.top_spin.valueChanged.connect(restart)
+        self.sort_combo.currentIndexChanged.connect(restart)
         self.apply_btn.clicked.connect(self.apply_settings)
         self.refresh_btn.clicked.connect(self.force_refresh)
         self.process_list.itemDoubleClicked.connect(self.on_process_double_click)
         self.interval_spin.valueChanged.connect(self.on_interval_change)
-        for p in psutil.process_iter(): 
-            try: p.cpu_percent(interval=None)
-            except Exception: pass
-        self.update_all()
-
-    def on_interval_change(self, val): self.timer.setInterval(val)
-    def apply_settings(self): self.timer.setInterval(self.interval_spin.value()); self.update_all(); self.status.showMessage("Settings applied", 2000)
-    def format_bytes_per_sec(self, bps): return f"{bps:.1f} B/s" if bps<1024 else f"{bps/1024:.1f} KB/s" if bps/1024<1024 else f"{bps/1024/1024:.1f} MB/s"
-    def update_partitions(self):
-        self.partitions_list.clear()
-        try: parts = psutil.disk_partitions(all=False)
-        except Exception: parts = []
-        for p in parts:
-            try: u = psutil.disk_usage(p.mountpoint)
-            except Exception: continue
-            w = PartitionWidget(p.device, p.mountpoint, u.percent, u.used, u.total)
+        self.sampler_thread.start()
+
+    def closeEvent(self, event):
+        self.sampler_thread.quit(); self.sampler_thread.wait()
+        super().closeEvent(event)
+    def is_hidden(self): return self.isMinimized() or not self.isVisible()
+    def changeEvent(self, event):
+        super().changeEvent(event)
+        if event.type() == QtCore.QEvent.WindowStateChange: self.check_visibility()
+    def showEvent(self, event): super().showEvent(event); self.check_visibility()
+    def hideEvent(self, event): super().hideEvent(event); self.check_visibility()
+    def check_visibility(self):
+        hidden = self.is_hidden()
+        if hidden == self._was_hidden: return
+        self._was_hidden = hidden
+        if hidden: self.visibility_changed.emit(False)
+        else: self.catch_up()
+    def catch_up(self):
+        if self.last_sample is not None: self.on_sample(self.last_sample)
+        self.request_plots(); self.visibility_changed.emit(True)
+    def on_interval_change(self, val): self.interval_changed.emit(val); self.plot_timer.setInterval(val * PLOT_INTERVAL_MULTIPLIER)
+    def apply_settings(self): self.on_interval_change(self.interval_spin.value()); self.refresh_requested.emit(); self.status.showMessage("Settings applied", 2000)
+    def format_bytes_per_sec(self, bps): unit=min(2, max(0, int(bps).bit_length()-1)//10); return f"{bps/(1<<(10*unit)):.1f} {_RATE_UNITS[unit]}"
+    def update_partitions(self, parts):
+        keys = [(device, mountpoint) for device, mountpoint, *_ in parts]
+        if keys == self._partition_keys:
+            for w, (device, mountpoint, percent, used, total) in zip(self._partition_widgets, parts): w.update_usage(percent, used, total)
+            return
+        self.partitions_list.clear(); self._partition_keys = keys; self._partition_widgets = []
+        for device, mountpoint, percent, used, total in parts:
+            w = PartitionWidget(device, mountpoint, percent, used, total); self._partition_widgets.append(w)
             item = QListWidgetItem(self.partitions_list); item.setSizeHint(w.sizeHint()); self.partitions_list.addItem(item); self.partitions_list.setItemWidget(item,w)
-    def update_all(self):
-        s = self.data.sample(); cpu, ram, disk_percent, sent, recv = s['cpu'], s['ram'], s['disk_percent'], s['net_sent'], s['net_recv']
+    def on_sample(self, s):
+        self.last_sample = s
+        if self.is_hidden(): return
+        cpu, ram, disk_percent, sent, recv = s['cpu'], s['ram'], s['disk_percent'], s['net_sent'], s['net_recv']
         self.cpu_label.setText(f"CPU: {cpu:.1f}%"); self.cpu_bar.setValue(int(min(100,cpu)))
-        vm = psutil.virtual_memory(); self.ram_label.setText(f"RAM: {vm.percent:.1f}% ({human_readable_bytes(vm.used)} / {human_readable_bytes(vm.total)})"); self.ram_bar.setValue(int(min(100,vm.percent)))
+        self.ram_label.setText(f"RAM: {ram:.1f}% ({human_readable_bytes(s['ram_used'])} / {human_readable_total(s['ram_total'])})"); self.ram_bar.setValue(int(min(100,ram)))
         self.disk_label.setText(f"Disk: {disk_percent:.1f}%"); self.disk_bar.setValue(int(min(100,disk_percent)))
         self.net_up_label.setText("Up: "+self.format_bytes_per_sec(sent)); self.net_down_label.setText("Down: "+self.format_bytes_per_sec(recv))
-        self.update_partitions(); x=list(range(-len(self.data.cpu_hist)+1,1)); self.cpu_curve.setData(x,list(self.data.cpu_hist))
-        self.ram_curve.setData(x,list(self.data.ram_hist)); self.disk_curve.setData(x,list(self.data.disk_hist))
-        self.net_sent_curve.setData(x,[s/1024.0 for s in self.data.net_sent_hist]); self.net_recv_curve.setData(x,[r/1024.0 for r in self.data.net_recv_hist])
-        self.update_process_list()
+        self.update_partitions(s['partitions'])
+    def request_plots(self):
+        if not self.is_hidden(): self.plot_requested.emit()
+    def update_plots(self, s):
+        if self.is_hidden(): return
+        x=self.x_axis; opts=dict(skipFiniteCheck=True, connect='all'); self.cpu_curve.setData(x,s['cpu_hist'],**opts)
+        self.ram_curve.setData(x,s['ram_hist'],**opts); self.disk_curve.setData(x,s['disk_hist'],**opts)
+        self.net_sent_curve.setData(x,s['net_sent_kbps_hist'],**opts); self.net_recv_curve.setData(x,s['net_recv_kbps_hist'],**opts)
+    def on_processes(self, procs):
+        self.procs = procs
+        if not self.is_hidden(): self.update_process_list()
     def update_process_list(self):
-        q = self.search_input.text().strip().lower(); top_n=int(self.top_spin.value()); s=self.sort_combo.currentText(); procs=[]
-        for p in psutil.process_iter(['pid','name']):
-            try: info = p.info; pid=info.get('pid'); name=info.get('name') or str(pid); cpu=p.cpu_percent(interval=None); mem=p.memory_percent(); procs.append((name,pid,cpu,mem,p))
-            except (psutil.NoSuchProcess, psutil.AccessDenied): continue
-        if s=="CPU": procs.sort(key=lambda t:t[2],reverse=True)
-        elif s=="RAM": procs.sort(key=lambda t:t[3],reverse=True)
-        elif s=="PID": procs.sort(key=lambda t:t[1])
-        else: procs.sort(key=lambda t:(t[0] or "").lower())
-        if q: procs=[t for t in procs if q in (t[0] or '').lower() or q==str(t[1])]
-        procs=procs[:top_n]; self.process_list.clear()
-        for name,pid,cpu,mem,p in procs: w=ProcessItemWidget(name,pid,cpu,mem); item=QListWidgetItem(self.process_list); item.setSizeHint(w.sizeHint()); self.process_list.addItem(item); self.process_list.setItemWidget(item,w)
-    def force_refresh(self): self.data.sample(); self.update_all(); self.status.showMessage("Refreshed",1000)
+        q = self.search_input.text().strip().lower(); top_n=int(self.top_spin.value()); s=self.sort_combo.currentText()
+        procs=self.procs
+        if q:
+            # t[5] is the cached lowercased name
+            if q.isdecimal(): want=int(q); keep=lambda t: want==t[1] or q in t[5]
+            else: keep=lambda t: q in t[5]
+            procs=[t for t in procs if keep(t)]
+        if s=="CPU": procs=heapq.nlargest(top_n,procs,key=lambda t:t[2])
+        elif s=="RAM": procs=heapq.nlargest(top_n,procs,key=lambda t:t[3])
+        elif s=="PID": procs=sorted(procs,key=lambda t:t[1])[:top_n]
+        else: procs=sorted(procs,key=lambda t:t[5])[:top_n]
+        rows=self._row_widgets
+        # rows are reused by position: takeItem() would destroy the item widget, so only the row count changes and
+        # existing widgets are repointed at whichever process now sorts into their slot
+        while len(rows)>len(procs): self.process_list.takeItem(len(rows)-1); rows.pop()
+        for i,(name,pid,cpu,mem,p,_) in enumerate(procs):
+            if i<len(rows): rows[i].set_process(name,pid,cpu,mem); continue
+            w=ProcessItemWidget(name,pid,cpu,mem); rows.append(w); item=QListWidgetItem(self.process_list); item.setSizeHint(w.sizeHint()); self.process_list.addItem(item); self.process_list.setItemWidget(item,w)
+    def force_refresh(self): self.refresh_requested.emit(); self.status.showMessage("Refreshed",1000)
     def on_process_double_click(self,item):
         w=self.process_list.itemWidget(item); 
         if not w: return